@@ -0,0 +1,87 @@
+import itertools
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import main
+
+REQUIRED_ENV = {
+    'EMAIL_USER': 'monitor@example.com',
+    'EMAIL_PASSWORD': 'password',
+    'NOTIFICATION_EMAIL': 'alerts@example.com',
+    'REDDIT_CLIENT_ID': 'client-id',
+    'REDDIT_CLIENT_SECRET': 'client-secret',
+}
+
+_post_ids = itertools.count(1)
+
+
+def make_submission(subreddit='glasgow', title='Free ticket tonight', selftext='', author='alice',
+                    age_hours=1.0, score=5, flair=None):
+    """A stand-in for a praw Submission carrying the listing fields the monitor reads"""
+    post_id = f'p{next(_post_ids)}'
+    return SimpleNamespace(
+        id=post_id,
+        subreddit=SimpleNamespace(display_name=subreddit),
+        title=title,
+        selftext=selftext,
+        author=SimpleNamespace(name=author) if author else None,
+        created_utc=time.time() - age_hours * 3600,
+        score=score,
+        permalink=f'/r/{subreddit}/comments/{post_id}/',
+        link_flair_text=flair,
+    )
+
+
+class FakeSubreddit:
+    def __init__(self, reddit, name):
+        self._reddit = reddit
+        self._names = {part.lower() for part in name.split('+')}
+        self.name = name
+
+    def _posts(self):
+        if self.name in self._reddit.failing:
+            raise RuntimeError(f'r/{self.name} is unavailable')
+        posts = [p for p in self._reddit.posts if p.subreddit.display_name.lower() in self._names]
+        return sorted(posts, key=lambda p: p.created_utc, reverse=True)
+
+    def new(self, limit=100):
+        self._reddit.calls.append(('new', self.name, limit))
+        return iter(self._posts()[:limit])
+
+    def search(self, query, sort='new', time_filter='day', limit=20):
+        self._reddit.calls.append(('search', self.name))
+        flair = query.split('"')[1]
+        return iter([p for p in self._posts() if p.link_flair_text == flair][:limit])
+
+
+class FakeReddit:
+    """Serves listings newest first from a fixed list of submissions, recording each request"""
+
+    def __init__(self, posts, failing=()):
+        self.posts = posts
+        self.failing = set(failing)
+        self.calls = []
+
+    def subreddit(self, name):
+        return FakeSubreddit(self, name)
+
+
+class MonitorTestCase(unittest.TestCase):
+    """Runs each test in an empty directory so no real state files are read or written"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def make_monitor(self, **env):
+        with mock.patch.dict(os.environ, dict(REQUIRED_ENV, **env)):
+            return main.RedditMonitor()
@@ -0,0 +1,44 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+
+from support import MonitorTestCase, make_submission
+
+
+class AnalyticsRetentionTest(MonitorTestCase):
+    def write_old_analytics(self):
+        # Written by code that predates ts_epoch, newest match first
+        now = datetime.now()
+        matches = [
+            {'timestamp': (now - timedelta(days=2)).isoformat(), 'post_id': 'recent'},
+            {'timestamp': (now - timedelta(days=40)).isoformat(), 'post_id': 'stale'},
+            {'timestamp': (now - timedelta(days=31)).isoformat(), 'post_id': 'expired'},
+        ]
+        with open('analytics.json', 'w') as f:
+            json.dump({'matches': matches, 'keywords_stats': {}, 'subreddit_stats': {},
+                       'user_stats': {}, 'filter_stats': {}}, f)
+        return matches
+
+    def test_analytics_without_ts_epoch_still_loads(self):
+        matches = self.write_old_analytics()
+        monitor = self.make_monitor()
+
+        loaded = list(monitor.analytics['matches'])
+        self.assertEqual([m['post_id'] for m in loaded], ['stale', 'expired', 'recent'])
+        for match in loaded:
+            original = next(m for m in matches if m['post_id'] == match['post_id'])
+            self.assertEqual(match['ts_epoch'], datetime.fromisoformat(original['timestamp']).timestamp())
+
+    def test_matches_older_than_thirty_days_are_trimmed(self):
+        self.write_old_analytics()
+        monitor = self.make_monitor()
+
+        monitor.update_analytics_for_match(make_submission(), 'glasgow', ['free'])
+
+        post_ids = [m['post_id'] for m in monitor.analytics['matches']]
+        self.assertEqual(post_ids[0], 'recent')
+        self.assertEqual(len(post_ids), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
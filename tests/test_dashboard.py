@@ -0,0 +1,43 @@
+import unittest
+
+from support import MonitorTestCase, make_submission
+
+
+class DashboardWriteTest(MonitorTestCase):
+    def read(self, path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_skips_write_when_only_the_timestamp_changed(self):
+        monitor = self.make_monitor()
+        self.assertTrue(monitor.save_dashboard_html('index.html'))
+        # Pretend the page on disk came from an earlier run
+        stale = self.read('index.html').replace('Last updated: ', 'Last updated: 2000-01-01 00:00:00 was ', 1)
+        with open('index.html', 'w', encoding='utf-8') as f:
+            f.write(stale)
+
+        self.assertTrue(monitor.save_dashboard_html('index.html'))
+        self.assertEqual(self.read('index.html'), stale)
+
+    def test_rewrites_a_page_written_without_a_digest(self):
+        monitor = self.make_monitor()
+        with open('index.html', 'w', encoding='utf-8') as f:
+            f.write(monitor.generate_analytics_dashboard())
+
+        monitor.save_dashboard_html('index.html')
+        self.assertIn('<meta name="dashboard-digest"', self.read('index.html'))
+
+    def test_rewrites_when_the_content_changed(self):
+        monitor = self.make_monitor()
+        monitor.save_dashboard_html('index.html')
+        before = self.read('index.html')
+
+        monitor.update_analytics_for_match(make_submission(), 'glasgow', ['free ticket'])
+        monitor.save_dashboard_html('index.html')
+        after = self.read('index.html')
+        self.assertNotEqual(after, before)
+        self.assertIn('Free ticket tonight', after)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from support import MonitorTestCase, make_submission
+
+
+def brute_force_duplicate(seen_posts, text, author, similarity_threshold):
+    """The original pairwise check: Jaccard over lowercase word sets against every stored post"""
+    words = set(text.lower().split())
+    for stored in seen_posts.values():
+        if not isinstance(stored, dict):
+            continue
+        stored_words = set(stored['text'].lower().split())
+        if not words or not stored_words:
+            continue
+        similarity = len(words & stored_words) / len(words | stored_words)
+        threshold = 0.6 if author == stored['author'] else similarity_threshold
+        if similarity > threshold:
+            return True
+    return False
+
+
+class DeduplicationTest(MonitorTestCase):
+    def make_monitor(self, seen_posts, similarity_threshold='0.8'):
+        monitor = super().make_monitor(SIMILARITY_THRESHOLD=similarity_threshold)
+        monitor.seen_posts = seen_posts
+        return monitor
+
+    def is_duplicate(self, monitor, text, author):
+        return monitor.should_exclude_by_deduplication(make_submission(title=text, author=author))
+
+    def test_matches_the_pairwise_check_on_random_posts(self):
+        rng = random.Random(1234)
+        vocabulary = ['free', 'ticket', 'gig', 'tonight', 'spare', 'seat', 'barrowland', 'swg3']
+        authors = ['alice', 'bob', 'carol']
+        for similarity_threshold in ('0.4', '0.6', '0.8', '1.0'):
+            seen_posts = {'flair': 1700000000.0}
+            for i in range(40):
+                words = rng.sample(vocabulary, rng.randint(1, 6))
+                seen_posts[f's{i}'] = {'text': ' '.join(words), 'author': rng.choice(authors), 'ts_epoch': 0}
+            monitor = self.make_monitor(seen_posts, similarity_threshold)
+
+            for _ in range(300):
+                text = ' '.join(rng.choice(vocabulary).upper() if rng.random() < 0.2 else rng.choice(vocabulary)
+                                for _ in range(rng.randint(0, 7)))
+                author = rng.choice(authors + ['dave'])
+                with self.subTest(threshold=similarity_threshold, text=text, author=author):
+                    self.assertEqual(self.is_duplicate(monitor, text, author),
+                                     brute_force_duplicate(seen_posts, text, author, float(similarity_threshold)))
+
+    def test_similarity_exactly_at_the_threshold_is_not_a_duplicate(self):
+        monitor = self.make_monitor({'s': {'text': 'a b c d e', 'author': 'alice', 'ts_epoch': 0}})
+        self.assertFalse(self.is_duplicate(monitor, 'a b c d', 'bob'))      # 4/5 == 0.8
+        self.assertFalse(self.is_duplicate(monitor, 'a b c', 'alice'))      # 3/5 == 0.6, same author
+        self.assertTrue(self.is_duplicate(monitor, 'a b c d e f', 'alice'))  # 5/6 > 0.6
+
+    def test_very_short_texts(self):
+        monitor = self.make_monitor({'s': {'text': 'tickets', 'author': 'alice', 'ts_epoch': 0}})
+        self.assertTrue(self.is_duplicate(monitor, 'Tickets', 'bob'))
+        self.assertFalse(self.is_duplicate(monitor, 'ticket', 'bob'))
+        self.assertFalse(self.is_duplicate(monitor, 'tickets please', 'bob'))  # 1/2
+
+    def test_empty_word_sets_never_match(self):
+        monitor = self.make_monitor({'s': {'text': '', 'author': 'alice', 'ts_epoch': 0}})
+        self.assertFalse(self.is_duplicate(monitor, '', 'alice'))
+        self.assertFalse(self.is_duplicate(monitor, '   ', 'alice'))
+        self.assertFalse(self.is_duplicate(monitor, 'free ticket', 'alice'))
+
+    def test_exact_repost_from_another_author_respects_a_threshold_of_one(self):
+        monitor = self.make_monitor({'s': {'text': 'free ticket tonight', 'author': 'alice', 'ts_epoch': 0}}, '1.0')
+        self.assertFalse(self.is_duplicate(monitor, 'tonight free ticket', 'bob'))
+        self.assertTrue(self.is_duplicate(monitor, 'tonight free ticket', 'alice'))
+
+
+if __name__ == '__main__':
+    unittest.main()
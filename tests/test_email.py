@@ -0,0 +1,95 @@
+import smtplib
+import unittest
+from unittest import mock
+
+from support import MonitorTestCase
+
+
+class FakeSMTP:
+    """Records what the monitor does with a connection; no network involved"""
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.noops = 0
+        self.logins = 0
+        self.closed = False
+        self.noop_code = 250
+        self.drop_next_send = False
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def noop(self):
+        self.noops += 1
+        return self.noop_code, b'OK'
+
+    def send_message(self, msg):
+        if self.drop_next_send:
+            self.drop_next_send = False
+            raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        self.sent.append(msg['Subject'])
+
+    def quit(self):
+        self.closed = True
+
+
+class SmtpConnectionTest(MonitorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.connections = []
+
+        def connect(*args, **kwargs):
+            server = FakeSMTP(*args, **kwargs)
+            self.connections.append(server)
+            return server
+
+        patcher = mock.patch('main.smtplib.SMTP', side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monitor = self.make_monitor()
+
+    def test_connection_is_reused_between_emails(self):
+        self.assertTrue(self.monitor.send_email('one', 'body'))
+        self.assertTrue(self.monitor.send_email('two', 'body'))
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(self.connections[0].sent, ['one', 'two'])
+        self.assertEqual(self.connections[0].logins, 1)
+        self.assertEqual(self.connections[0].noops, 0)
+
+    def test_idle_connection_is_probed_and_kept_when_alive(self):
+        self.monitor.send_email('one', 'body')
+        self.monitor._smtp_last_used -= self.monitor.smtp_idle_check_seconds + 1
+        self.monitor.send_email('two', 'body')
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(self.connections[0].noops, 1)
+        self.assertEqual(self.connections[0].sent, ['one', 'two'])
+
+    def test_idle_connection_is_replaced_when_probe_fails(self):
+        self.monitor.send_email('one', 'body')
+        self.connections[0].noop_code = 421
+        self.monitor._smtp_last_used -= self.monitor.smtp_idle_check_seconds + 1
+        self.monitor.send_email('two', 'body')
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(self.connections[0].closed)
+        self.assertEqual(self.connections[1].sent, ['two'])
+
+    def test_dropped_connection_is_reconnected_once(self):
+        self.monitor.send_email('one', 'body')
+        self.connections[0].drop_next_send = True
+        self.assertTrue(self.monitor.send_email('two', 'body'))
+        self.assertEqual(len(self.connections), 2)
+        self.assertEqual(self.connections[1].sent, ['two'])
+
+    def test_close_quits_the_cached_connection(self):
+        self.monitor.send_email('one', 'body')
+        self.monitor.close()
+        self.assertTrue(self.connections[0].closed)
+        self.assertIsNone(self.monitor._smtp)
+        self.monitor.close()  # Closing again is harmless
+
+
+if __name__ == '__main__':
+    unittest.main()
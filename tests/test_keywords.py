@@ -0,0 +1,51 @@
+import unittest
+
+from support import MonitorTestCase
+
+
+class KeywordMatchingTest(MonitorTestCase):
+    def test_reports_keywords_overlapping_at_the_same_start(self):
+        monitor = self.make_monitor(KEYWORDS='free,free ticket,tickets,giveaway', EXCLUSION_KEYWORDS='sold')
+        self.assertEqual(monitor.contains_keywords('Free ticket for tonight'), ['free', 'free ticket'])
+        self.assertEqual(monitor.analytics['keywords_stats']['free']['count'], 1)
+        self.assertEqual(monitor.analytics['keywords_stats']['free ticket']['count'], 1)
+
+    def test_reports_keywords_overlapping_at_different_starts(self):
+        monitor = self.make_monitor(KEYWORDS='free ticket,tickets', EXCLUSION_KEYWORDS='sold')
+        self.assertEqual(monitor.contains_keywords('Two free tickets going'), ['tickets'])
+        self.assertEqual(monitor.contains_keywords('Free ticket, spare tickets too'), ['free ticket', 'tickets'])
+
+    def test_exclusion_keyword_vetoes_matches(self):
+        monitor = self.make_monitor(KEYWORDS='free ticket', EXCLUSION_KEYWORDS='sold')
+        self.assertTrue(monitor.should_exclude_by_keywords('Free ticket - now SOLD'))
+        self.assertEqual(monitor.contains_keywords('Free ticket - now SOLD'), [])
+        self.assertEqual(monitor.analytics['filter_stats']['excluded_by_keywords'], 1)
+
+    def test_scan_cap_applies_to_keywords_but_not_exclusions(self):
+        monitor = self.make_monitor(KEYWORDS='free ticket', EXCLUSION_KEYWORDS='sold', MAX_SCAN_CHARS='20')
+        padding = ' filler' * 10
+        self.assertEqual(monitor.contains_keywords('Free ticket' + padding), ['free ticket'])
+        self.assertEqual(monitor.contains_keywords('Spare seat' + padding + ' free ticket'), [])
+        self.assertEqual(monitor.contains_keywords('Free ticket' + padding + ' sold'), [])
+
+    def test_scan_cap_never_splits_a_word(self):
+        monitor = self.make_monitor(KEYWORDS='ticket', EXCLUSION_KEYWORDS='sold', MAX_SCAN_CHARS='20')
+        # The cap lands right after 'ticket' inside 'ticketing'
+        self.assertEqual(monitor.contains_keywords(' ' * 14 + 'ticketing'), [])
+        self.assertEqual(monitor.contains_keywords(' ' * 14 + 'ticket here'), ['ticket'])
+
+    def test_scan_cap_is_off_by_default(self):
+        monitor = self.make_monitor(KEYWORDS='free ticket', EXCLUSION_KEYWORDS='sold')
+        self.assertEqual(monitor.contains_keywords('Spare seat' + ' filler' * 2000 + ' free ticket'), ['free ticket'])
+
+    def test_non_positive_scan_cap_means_no_cap(self):
+        monitor = self.make_monitor(KEYWORDS='free ticket', EXCLUSION_KEYWORDS='sold', MAX_SCAN_CHARS='0')
+        self.assertEqual(monitor.contains_keywords('Spare seat' + ' filler' * 10 + ' free ticket'), ['free ticket'])
+
+    def test_regex_keyword_with_inline_flag(self):
+        monitor = self.make_monitor(KEYWORDS='(?i)free,(a)\\1', ENABLE_REGEX_KEYWORDS='true', EXCLUSION_KEYWORDS='sold')
+        self.assertEqual(monitor.contains_keywords('FREE stuff, aa'), ['(?i)free', '(a)\\1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+from support import FakeReddit, MonitorTestCase, make_submission
+
+QUIET_ENV = {'KEYWORDS': 'free ticket', 'EXCLUSION_KEYWORDS': 'sold', 'ENABLE_USER_FILTERING': 'false'}
+
+
+class CheckAllSubredditsTest(MonitorTestCase):
+    def make_monitor(self, posts, failing=(), **env):
+        monitor = super().make_monitor(**dict(QUIET_ENV, **env))
+        monitor.flair_priority = {}
+        monitor.reddit = FakeReddit(posts, failing)
+        monitor._send_error_notification = mock.Mock()
+        return monitor
+
+    def test_routes_the_combined_listing_by_subreddit_in_one_request(self):
+        posts = [
+            make_submission('glasgow', 'Free ticket for the gig'),
+            make_submission('GlasgowMarket', 'Free ticket, spare seat', age_hours=2),
+            make_submission('glasgow', 'Selling a sofa', age_hours=3),
+        ]
+        monitor = self.make_monitor(posts)
+
+        matches = monitor.check_all_subreddits()
+
+        self.assertEqual([(p['subreddit'], p['title']) for p in matches],
+                         [('glasgow', 'Free ticket for the gig'), ('glasgowmarket', 'Free ticket, spare seat')])
+        self.assertEqual(monitor.reddit.calls, [('new', 'glasgow+glasgowmarket', 100)])
+        self.assertEqual(monitor.analytics['filter_stats']['total_posts_checked'], 3)
+
+    def test_tops_up_a_subreddit_crowded_out_of_a_full_page(self):
+        posts = [make_submission('glasgow', f'Chat {i}', age_hours=0.1 * (i + 1)) for i in range(6)]
+        posts.append(make_submission('glasgowmarket', 'Free ticket going', age_hours=5))
+        monitor = self.make_monitor(posts, MAX_POSTS_PER_RUN='2')
+
+        matches = monitor.check_all_subreddits()
+
+        self.assertEqual([p['title'] for p in matches], ['Free ticket going'])
+        self.assertEqual(monitor.reddit.calls, [('new', 'glasgow+glasgowmarket', 4), ('new', 'glasgowmarket', 2)])
+        # The glasgow cap was reached from the combined page, so it needs no top-up
+        self.assertEqual(monitor.analytics['filter_stats']['total_posts_checked'], 3)
+
+    def test_a_failing_top_up_does_not_cost_the_other_subreddits(self):
+        posts = [make_submission('glasgow', f'Chat {i}', age_hours=0.1 * (i + 1)) for i in range(9)]
+        posts.append(make_submission('scotland', 'Free ticket in Perth', age_hours=5))
+        monitor = self.make_monitor(posts, failing={'glasgowmarket'}, MAX_POSTS_PER_RUN='2')
+        monitor.subreddits = ['glasgow', 'glasgowmarket', 'scotland']
+
+        with self.assertLogs('main', level='INFO') as logs:
+            matches = monitor.check_all_subreddits()
+
+        self.assertEqual([p['title'] for p in matches], ['Free ticket in Perth'])
+        monitor._send_error_notification.assert_called_once()
+        self.assertEqual(monitor._send_error_notification.call_args[0][0], 'glasgowmarket')
+        self.assertTrue(any('Checked 1 posts in r/scotland' in line for line in logs.output))
+
+    def test_client_construction_failure_is_reported_not_raised(self):
+        monitor = self.make_monitor([])
+        monitor.reddit = None
+        monitor.flair_priority = {'glasgow': 'Ticket share'}
+
+        with mock.patch.object(monitor, '_init_reddit', side_effect=RuntimeError('no client')):
+            self.assertEqual(monitor.check_all_subreddits(), [])
+
+        monitor._send_error_notification.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import threading
+import unittest
+
+from support import MonitorTestCase
+
+
+class NotificationFanOutTest(MonitorTestCase):
+    def test_concurrent_notifiers_get_separate_http_sessions(self):
+        monitor = self.make_monitor()
+        barrier = threading.Barrier(2, timeout=5)
+        sessions = {}
+
+        def notifier(name):
+            def send():
+                # Both notifiers must be in flight at once to pass the barrier
+                barrier.wait()
+                session = monitor._http_session()
+                sessions[name] = session
+                return session is monitor._http_session()
+            return send
+
+        sent = monitor._run_notification_tasks([('a', notifier('a')), ('b', notifier('b'))])
+        self.assertEqual(sorted(sent), ['a', 'b'])
+        self.assertIsNot(sessions['a'], sessions['b'])
+
+    def test_failing_notifier_is_reported_and_does_not_block_others(self):
+        monitor = self.make_monitor()
+
+        def boom():
+            raise RuntimeError('webhook down')
+
+        with self.assertLogs('main', level='ERROR') as logs:
+            sent = monitor._run_notification_tasks([
+                ('ok', lambda: True),
+                ('declined', lambda: False),
+                ('boom', boom),
+            ])
+        self.assertEqual(sent, ['ok'])
+        self.assertTrue(any('Failed to send boom notification: webhook down' in line for line in logs.output))
+
+
+if __name__ == '__main__':
+    unittest.main()
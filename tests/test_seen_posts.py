@@ -0,0 +1,104 @@
+import json
+import time
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import main
+from support import MonitorTestCase
+
+DAY = 86400
+
+
+class CleanupOldPostsTest(MonitorTestCase):
+    def test_expires_the_old_prefix_including_legacy_and_undecodable_entries(self):
+        monitor = self.make_monitor()
+        now = time.time()
+        monitor.seen_posts = {
+            'old_dict': {'text': 'a', 'author': 'x', 'ts_epoch': now - 10 * DAY},
+            'old_iso': datetime.fromtimestamp(now - 9 * DAY).isoformat(),
+            'old_legacy_dict': {'text': 'b', 'author': 'y', 'timestamp': datetime.fromtimestamp(now - 9 * DAY).isoformat()},
+            'broken': '{"text": "never decoded',
+            'old_flair': now - 8 * DAY,
+            'recent': {'text': 'c', 'author': 'z', 'ts_epoch': now - DAY},
+            'recent_flair': now - 60,
+        }
+
+        monitor.cleanup_old_posts(7)
+
+        self.assertEqual(list(monitor.seen_posts), ['recent', 'recent_flair'])
+        self.assertTrue(monitor._seen_posts_dirty)
+
+    def test_overflow_cap_drops_the_oldest_entries(self):
+        monitor = self.make_monitor()
+        monitor.max_seen_posts = 3
+        now = time.time()
+        monitor.seen_posts = {f'p{i}': now - (5 - i) * 60 for i in range(5)}
+
+        monitor.cleanup_old_posts(7)
+
+        self.assertEqual(list(monitor.seen_posts), ['p2', 'p3', 'p4'])
+
+    def test_nothing_to_clean_leaves_the_state_clean(self):
+        monitor = self.make_monitor()
+        monitor.seen_posts = {'recent': time.time()}
+        monitor._seen_posts_dirty = False
+
+        monitor.cleanup_old_posts(7)
+
+        self.assertEqual(list(monitor.seen_posts), ['recent'])
+        self.assertFalse(monitor._seen_posts_dirty)
+
+
+class SeenPostsRoundTripTest(MonitorTestCase):
+    def write_legacy_file(self):
+        # Older versions stored keyword entries as JSON strings, ASCII-escaped by json.dump
+        entry = {'text': 'café ticket tonight', 'author': 'alice', 'timestamp': '2025-08-01T12:00:00'}
+        with open('seen_posts.json', 'w') as f:
+            json.dump({
+                'seen_posts': {
+                    'keyword_post': json.dumps(entry),
+                    'iso_post': '2025-08-02T09:30:00',
+                    'flair_post': 1754000000.5,
+                },
+                'last_updated': '2025-08-02T10:00:00',
+                'total_posts': 3,
+            }, f, indent=2)
+        return entry
+
+    def assert_round_trip(self):
+        entry = self.write_legacy_file()
+        monitor = self.make_monitor()
+        loaded = monitor.seen_posts
+        self.assertEqual(loaded['keyword_post'], entry)
+        self.assertEqual(loaded['iso_post'], '2025-08-02T09:30:00')
+        self.assertEqual(loaded['flair_post'], 1754000000.5)
+
+        monitor._seen_posts_dirty = True
+        monitor.save_seen_posts()
+        with open('seen_posts.json', 'rb') as f:
+            saved = json.loads(f.read())
+        self.assertEqual(saved['seen_posts'], loaded)
+        self.assertEqual(saved['total_posts'], 3)
+        self.assertEqual(self.make_monitor().seen_posts, loaded)
+
+    @unittest.skipIf(main.orjson is None, 'orjson is not installed')
+    def test_legacy_file_round_trips_with_orjson(self):
+        self.assert_round_trip()
+
+    def test_legacy_file_round_trips_with_stdlib_json(self):
+        with mock.patch('main.orjson', None):
+            self.assert_round_trip()
+
+    @unittest.skipIf(main.orjson is None, 'orjson is not installed')
+    def test_file_saved_with_orjson_loads_without_it(self):
+        monitor = self.make_monitor()
+        monitor.seen_posts = {'p1': {'text': 'café', 'author': 'bob', 'timestamp': '2025-08-01T12:00:00', 'ts_epoch': 1.5}}
+        monitor._seen_posts_dirty = True
+        monitor.save_seen_posts()
+        with mock.patch('main.orjson', None):
+            self.assertEqual(self.make_monitor().seen_posts, monitor.seen_posts)
+
+
+if __name__ == '__main__':
+    unittest.main()